@@ -15,12 +15,18 @@ Original file is located at
 # 3. Contacts optimal hospitals based on availability/traffic
 # 4. Notifies emergency contacts
 
-import random
+import asyncio
 import time
-import json
+import math
+import re
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import orjson
+from numba import njit
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
+from typing import Any, Awaitable, Callable, List, Dict, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,7 +35,7 @@ logger = logging.getLogger(__name__)
 
 # DATA MODELS
 
-@dataclass
+@dataclass(slots=True)
 class Hospital:
     id: str
     name: str
@@ -37,26 +43,27 @@ class Hospital:
     contact_number: str
     coordinates: Dict[str, float]
 
-@dataclass
+@dataclass(slots=True)
 class EmergencyContact:
     name: str
     phone: str
 
-@dataclass
+@dataclass(slots=True)
 class MedicalHistory:
     allergies: List[str]
     conditions: List[str]
     medications: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class HospitalAvailability:
     available: bool
     wait_time: int
 
-@dataclass
-class TrafficAnalysis:
-    travel_time: int
-    distance_km: float
+@dataclass(slots=True)
+class TrafficBatch:
+    """Traffic to every hospital; index i matches Config.PRESELECTED_HOSPITALS[i]."""
+    travel_time: np.ndarray
+    distance_km: np.ndarray
 
 
 # CONFIGURATION
@@ -79,6 +86,10 @@ class Config:
         )
     ]
 
+    # Structure-of-arrays view of the hospitals; index i matches PRESELECTED_HOSPITALS[i]
+    HOSP_LATS = np.array([h.coordinates['lat'] for h in PRESELECTED_HOSPITALS])
+    HOSP_LONS = np.array([h.coordinates['lon'] for h in PRESELECTED_HOSPITALS])
+
     EMERGENCY_CONTACTS = [
         EmergencyContact(name="Family Member", phone="+19876543210"),
         EmergencyContact(name="Close Friend", phone="+19998887777")
@@ -90,6 +101,123 @@ class Config:
         "Please confirm availability and estimated time of arrival. This is an urgent request."
     )
 
+    # How long availability/traffic lookups stay valid before they are refreshed
+    CACHE_TTL_SECONDS = 300
+    # Upper bound on cached lookups; the oldest entries are evicted first
+    CACHE_MAX_ENTRIES = 256
+
+    # Upper bound on concurrent external lookups (hospital/traffic APIs)
+    MAX_CONCURRENT_REQUESTS = 10
+
+    # Seed for the simulated sensors/APIs; set an int to make runs reproducible
+    SIMULATION_SEED = None
+
+
+# Single RNG behind every simulated draw, so one seed reproduces a whole run
+_SIM_RNG = np.random.default_rng(Config.SIMULATION_SEED)
+
+
+def cheap_ruler(lat0_deg: float) -> Tuple[float, float]:
+    """
+    Kilometres per degree of longitude/latitude around a reference latitude.
+
+    Mapbox cheap-ruler approximation: accurate for city-scale distances and
+    needs no trigonometry once the factors are known.
+
+    Returns:
+        (kx, ky) multipliers for longitude and latitude differences
+    """
+    lat0 = math.radians(lat0_deg)
+    kx = 111.41513 * math.cos(lat0) - 0.09455 * math.cos(3 * lat0) + 0.00012 * math.cos(5 * lat0)
+    ky = 111.13209 - 0.56605 * math.cos(2 * lat0) + 0.0012 * math.cos(4 * lat0)
+    return kx, ky
+
+
+@njit(cache=True)
+def rank_hospitals(travel_times: np.ndarray, wait_times: np.ndarray,
+                   available: np.ndarray) -> int:
+    """
+    Index of the best available hospital, or -1 if none are available.
+
+    Scores favour short travel (70%) over short waits (30%); zero times are
+    treated as one minute to avoid division by zero.
+    """
+    best = -1
+    best_score = -np.inf
+    for i in range(travel_times.shape[0]):
+        if not available[i]:
+            continue
+        score = 0.7 / max(travel_times[i], 1) + 0.3 / max(wait_times[i], 1)
+        if score > best_score:
+            best = i
+            best_score = score
+    return best
+
+
+# Compile at import so the first emergency does not pay the JIT cost
+rank_hospitals(np.ones(1, dtype=np.int64), np.ones(1, dtype=np.int64), np.ones(1, dtype=np.bool_))
+
+
+# Symptom keywords matched in a single pass; group n sets flag bit n-1
+_SYMPTOM_RE = re.compile(r"(chest pain)|(arm|left)|(difficulty breathing)")
+_CHEST_PAIN, _ARM_PAIN, _BREATHING = 1, 2, 4
+
+# Triage result for every combination of keyword flags (None means moderate)
+_SYMPTOM_TRIAGE = tuple(
+    ("Severe chest pain, arm numbness", "critical") if flags & _CHEST_PAIN and flags & _ARM_PAIN
+    else ("Difficulty breathing", "critical") if flags & _BREATHING
+    else None
+    for flags in range(8)
+)
+
+
+def _escape_braces(value: str) -> str:
+    """Escape literal braces so the value survives a later str.format() call."""
+    return value.replace("{", "{{").replace("}", "}}")
+
+
+# LOOKUP CACHE
+
+# Entries are kept in creation order, so the oldest (and stalest) come first
+_LOOKUP_CACHE: OrderedDict[Tuple, Tuple[Any, float]] = OrderedDict()
+
+
+async def _cached_lookup(key: Tuple, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached value for key, recomputing it once it is older than the TTL."""
+    now = time.time()
+    hit = _LOOKUP_CACHE.get(key)
+    if hit is not None and now - hit[1] < Config.CACHE_TTL_SECONDS:
+        return hit[0]
+    value = await compute()
+    # Stamp after the await so concurrent lookups still append in creation order
+    now = time.time()
+    _LOOKUP_CACHE.pop(key, None)
+    _LOOKUP_CACHE[key] = (value, now)
+    # Purge expired entries, then evict the oldest while over the size bound
+    while _LOOKUP_CACHE:
+        oldest_created = next(iter(_LOOKUP_CACHE.values()))[1]
+        if (now - oldest_created < Config.CACHE_TTL_SECONDS
+                and len(_LOOKUP_CACHE) <= Config.CACHE_MAX_ENTRIES):
+            break
+        _LOOKUP_CACHE.popitem(last=False)
+    return value
+
+
+def _run_sync(coro: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    asyncio.run() refuses to start while an event loop is already running
+    (e.g. in Jupyter/Colab), so in that case the coroutine gets its own loop
+    on a worker thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 
 # CORE AI AGENT
 
@@ -109,8 +237,22 @@ class EmergencyAssistantAI:
         self.patient_address = patient_address
         self.patient_coordinates = patient_coordinates
         self.medical_history = medical_history or MedicalHistory([], [], [])
+        # Medical history does not change during a session; serialize it once
+        self._medical_history_json = orjson.dumps(self.medical_history).decode()
+        # Fill in the per-session fields once, leaving only the symptoms per alert.
+        # A single format pass never rescans substituted values for placeholders.
+        self._alert_template = Config.EMERGENCY_MESSAGE_TEMPLATE.format(
+            patient_address=_escape_braces(self.patient_address),
+            symptoms_summary="{symptoms_summary}",
+            medical_history_summary=_escape_braces(self._medical_history_json)
+        )
         self.current_symptoms = ""
         self.symptom_severity = "unknown"
+        # Patient latitude is fixed for the session, so the ruler factors are too
+        self._kx, self._ky = cheap_ruler(patient_coordinates['lat'])
+        # Hospital positions scaled to km once, leaving a subtraction per lookup
+        self._hosp_x_km = Config.HOSP_LONS * self._kx
+        self._hosp_y_km = Config.HOSP_LATS * self._ky
         logger.info(f"Initialized for patient at: {patient_address}")
 
 
@@ -125,7 +267,7 @@ class EmergencyAssistantAI:
     def _detect_emergency_trigger(self) -> bool:
         """Simulate emergency detection from sensors."""
         logger.info("Checking emergency triggers...")
-        return random.choices([True, False], weights=[0.1, 0.9])[0]
+        return bool(_SIM_RNG.random() < 0.1)
 
 
     # SYMPTOM ANALYSIS
@@ -135,86 +277,117 @@ class EmergencyAssistantAI:
         logger.info(f"Analyzing symptoms: {description}")
         description = description.lower()
 
-        if "chest pain" in description and ("arm" in description or "left" in description):
-            return "Severe chest pain, arm numbness", "critical"
-        elif "difficulty breathing" in description:
-            return "Difficulty breathing", "critical"
-        return description, "moderate"
+        flags = 0
+        for match in _SYMPTOM_RE.finditer(description):
+            flags |= 1 << (match.lastindex - 1)
+        return _SYMPTOM_TRIAGE[flags] or (description, "moderate")
 
 
     # HOSPITAL COORDINATION
 
-    def _check_hospital_availability(self, hospital: Hospital) -> HospitalAvailability:
+    async def _check_hospital_availability(self, hospital: Hospital,
+                                           semaphore: asyncio.Semaphore) -> HospitalAvailability:
+        """Hospital availability, reused across protocol runs within the cache TTL."""
+        async with semaphore:
+            return await _cached_lookup(
+                ("availability", hospital.id),
+                lambda: self._query_hospital_availability(hospital)
+            )
+
+    async def _query_hospital_availability(self, hospital: Hospital) -> HospitalAvailability:
         """Simulate hospital availability check."""
         logger.info(f"Checking availability for {hospital.name}")
+        # In production, await the hospital API with an async HTTP client
         return HospitalAvailability(
-            available=random.choices([True, False], weights=[0.8, 0.2])[0],
-            wait_time=random.randint(5, 60)
+            available=bool(_SIM_RNG.random() < 0.8),
+            wait_time=int(_SIM_RNG.integers(5, 60, endpoint=True))
         )
 
-    def _analyze_traffic(self, hospital: Hospital) -> TrafficAnalysis:
-        """Simulate traffic analysis."""
-        logger.info(f"Analyzing traffic to {hospital.name}")
-        # Simplified distance calculation
-        lat_diff = hospital.coordinates['lat'] - self.patient_coordinates['lat']
-        lon_diff = hospital.coordinates['lon'] - self.patient_coordinates['lon']
-        distance = ((lat_diff * 111)**2 + (lon_diff * 85)**2)**0.5
-        return TrafficAnalysis(
-            travel_time=int(distance * random.uniform(2, 5)),
-            distance_km=round(distance, 2)
+    async def _analyze_traffic(self, semaphore: asyncio.Semaphore) -> TrafficBatch:
+        """Traffic to all hospitals, reused across protocol runs within the cache TTL."""
+        key = ("traffic", self.patient_coordinates['lat'], self.patient_coordinates['lon'])
+        async with semaphore:
+            return await _cached_lookup(key, self._query_traffic)
+
+    async def _query_traffic(self) -> TrafficBatch:
+        """Simulate traffic analysis to all hospitals at once."""
+        logger.info("Analyzing traffic to all hospitals")
+        # In production, await a batched routing API with an async HTTP client
+        dy = self._hosp_y_km - self.patient_coordinates['lat'] * self._ky
+        dx = self._hosp_x_km - self.patient_coordinates['lon'] * self._kx
+        distance = np.hypot(dy, dx)
+        traffic_factor = _SIM_RNG.uniform(2, 5, size=distance.shape)
+        return TrafficBatch(
+            travel_time=(distance * traffic_factor).astype(int),
+            distance_km=np.round(distance, 2)
         )
 
-    def _select_optimal_hospital(self) -> Optional[Hospital]:
+    async def _select_optimal_hospital(self) -> Optional[Hospital]:
         """Select best hospital based on availability and travel time."""
         logger.info("Evaluating hospital options...")
 
-        ranked_hospitals = []
-        for hospital in Config.PRESELECTED_HOSPITALS:
-            availability = self._check_hospital_availability(hospital)
-            traffic = self._analyze_traffic(hospital)
-
-            if availability.available:
-                # Fix: use correct attribute names from TrafficAnalysis
-                travel_time = traffic.travel_time
-                wait_time = availability.wait_time
-                # Avoid division by zero
-                if travel_time == 0:
-                    travel_time = 1
-                if wait_time == 0:
-                    wait_time = 1
-                ranked_hospitals.append({
-                    "hospital": hospital,
-                    "travel_time": travel_time,
-                    "score": 0.7 * (1 / travel_time) + 0.3 * (1 / wait_time)
-                })
-
-        if not ranked_hospitals:
+        # All lookups are independent, so run them concurrently
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+        availability, traffic = await asyncio.gather(
+            asyncio.gather(*(self._check_hospital_availability(h, semaphore)
+                             for h in Config.PRESELECTED_HOSPITALS)),
+            self._analyze_traffic(semaphore)
+        )
+        best = rank_hospitals(
+            traffic.travel_time.astype(np.int64),
+            np.array([a.wait_time for a in availability], dtype=np.int64),
+            np.array([a.available for a in availability], dtype=np.bool_)
+        )
+        if best < 0:
             return None
 
-        return sorted(ranked_hospitals, key=lambda x: x['score'], reverse=True)[0]['hospital']
+        return Config.PRESELECTED_HOSPITALS[best]
 
 
      # NOTIFICATION SYSTEM
 
-    def _send_emergency_alert(self, hospital: Hospital):
+    async def _send_emergency_alert(self, hospital: Hospital):
         """Send alert to selected hospital."""
-        message = Config.EMERGENCY_MESSAGE_TEMPLATE.format(
-            patient_address=self.patient_address,
-            symptoms_summary=self.current_symptoms,
-            medical_history_summary=json.dumps(self.medical_history.__dict__)
-        )
+        message = self._alert_template.format(symptoms_summary=self.current_symptoms)
         logger.info(f"Sending alert to {hospital.name}")
         # In production, integrate with SMS/email API
 
-    def _notify_contacts(self):
-        """Notify all emergency contacts."""
-        for contact in Config.EMERGENCY_CONTACTS:
-            logger.info(f"Notifying {contact.name} at {contact.phone}")
+    async def _notify_contact(self, contact: EmergencyContact):
+        """Notify a single emergency contact."""
+        logger.info(f"Notifying {contact.name} at {contact.phone}")
+        # In production, integrate with SMS API
+
+    async def _notify_contacts(self):
+        """Notify all emergency contacts concurrently."""
+        results = await asyncio.gather(
+            *(self._notify_contact(contact) for contact in Config.EMERGENCY_CONTACTS),
+            return_exceptions=True
+        )
+        # One failed notification must not stop the others
+        for contact, result in zip(Config.EMERGENCY_CONTACTS, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to notify {contact.name}: {result}")
+
+    async def _dispatch_emergency_response(self, hospital: Hospital):
+        """Alert the hospital and notify contacts in parallel."""
+        await asyncio.gather(
+            self._send_emergency_alert(hospital),
+            self._notify_contacts()
+        )
 
 
     # MAIN PROTOCOL
 
     def execute_emergency_protocol(self):
+        """
+        Orchestrate the full emergency response, blocking until it completes.
+
+        Safe to call with or without a running event loop; async callers can
+        await execute_emergency_protocol_async() directly instead.
+        """
+        return _run_sync(self.execute_emergency_protocol_async())
+
+    async def execute_emergency_protocol_async(self):
         """Orchestrate the full emergency response."""
         logger.info("Initiating emergency protocol...")
 
@@ -232,19 +405,18 @@ class EmergencyAssistantAI:
         # Step 3: For critical cases, contact emergency directly
         if self.symptom_severity == "critical":
             logger.warning("CRITICAL CONDITION - Contacting emergency services directly")
-            self._notify_contacts()
+            await self._notify_contacts()
             return
 
         # Step 4: Coordinate hospital response
-        best_hospital = self._select_optimal_hospital()
+        best_hospital = await self._select_optimal_hospital()
         if not best_hospital:
             logger.error("No available hospitals found")
-            self._notify_contacts()
+            await self._notify_contacts()
             return
 
         # Step 5: Initiate emergency response
-        self._send_emergency_alert(best_hospital)
-        self._notify_contacts()
+        await self._dispatch_emergency_response(best_hospital)
         logger.info(f"Emergency protocol completed with {best_hospital.name}")
 
 
@@ -1,5 +1,6 @@
 # main_agent.py
 import os
+import functools
 import google.generativeai as genai
 from dotenv import load_dotenv
 import json
@@ -28,27 +29,24 @@ except Exception as e:
     logger.error(f"Failed to configure Gemini API: {e}")
     raise
 
+# Build the model once; tool schemas are introspected at construction time
+try:
+    _MODEL = genai.GenerativeModel(
+        model_name="gemini-1.5-pro-latest",
+        tools=[
+            get_user_location,
+            analyze_traffic_and_hospital_availability,
+            send_alert_to_hospital,
+            notify_emergency_contacts
+        ]
+    )
+except Exception as e:
+    logger.error(f"Failed to initialize Gemini model: {e}")
+    raise
 
-def run_emergency_protocol():
-    """
-    Orchestrates the entire emergency response using the Gemini agent.
-    """
-    try:
-        # 1. Initialize the Gemini Model with the tools
-        model = genai.GenerativeModel(
-            model_name="gemini-1.5-pro-latest",
-            tools=[
-                get_user_location,
-                analyze_traffic_and_hospital_availability,
-                send_alert_to_hospital,
-                notify_emergency_contacts
-            ]
-        )
-
-        chat = model.start_chat(enable_automatic_function_calling=True)
-
-        # 2. Define the Prompt / The Plan for the AI
-        prompt = """
+
+# The Prompt / The Plan for the AI
+_PROMPT_TEMPLATE = """
         You are an AI emergency response agent. A user needs to go to a hospital urgently.
         Your task is to automatically contact the best possible hospital and notify contacts.
         Follow these steps strictly in order:
@@ -67,12 +65,33 @@ def run_emergency_protocol():
         - Age: {age}
         - Blood Type: {blood_type}
         - Known Conditions: {conditions}
-        """.format(
-            name=USER_INFO.get("name", "Unknown"),
-            age=USER_INFO.get("age", "Unknown"),
-            blood_type=USER_INFO.get("blood_type", "Unknown"),
-            conditions=", ".join(USER_INFO.get("conditions", [])) or "None"
-        )
+        """
+
+
+@functools.lru_cache(maxsize=1)
+def _build_prompt():
+    """
+    Fills the prompt with the user's medical information.
+    USER_INFO is static, so the result is computed once and reused.
+    """
+    return _PROMPT_TEMPLATE.format(
+        name=USER_INFO.get("name", "Unknown"),
+        age=USER_INFO.get("age", "Unknown"),
+        blood_type=USER_INFO.get("blood_type", "Unknown"),
+        conditions=", ".join(USER_INFO.get("conditions", [])) or "None"
+    )
+
+
+def run_emergency_protocol():
+    """
+    Orchestrates the entire emergency response using the Gemini agent.
+    """
+    try:
+        # 1. Start a chat on the shared Gemini Model with the tools
+        chat = _MODEL.start_chat(enable_automatic_function_calling=True)
+
+        # 2. Build the Prompt / The Plan for the AI (cached after the first call)
+        prompt = _build_prompt()
 
         print("--- STARTING EMERGENCY PROTOCOL ---")
         print(f"USER: Help, I need to go to the hospital!")